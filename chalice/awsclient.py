@@ -24,11 +24,13 @@ import re
 import uuid
 
 import botocore.session  # noqa
+import botocore.config
 from botocore.exceptions import ClientError
 from botocore.vendored.requests import ConnectionError as \
     RequestsConnectionError
-from typing import Any, Optional, Dict, Callable, List, Iterator  # noqa
+from typing import Any, Optional, Dict, Callable, List, Iterator, Set  # noqa
 
+from chalice.compat import json_dumps_compact
 from chalice.constants import DEFAULT_STAGE_NAME
 from chalice.constants import MAX_LAMBDA_DEPLOYMENT_SIZE
 
@@ -37,6 +39,7 @@ _STR_MAP = Optional[Dict[str, str]]
 _OPT_STR = Optional[str]
 _OPT_INT = Optional[int]
 _CLIENT_METHOD = Callable[..., Dict[str, Any]]
+_OPT_CONFIG = Optional[botocore.config.Config]
 
 
 _REMOTE_CALL_ERRORS = (
@@ -79,10 +82,15 @@ class TypedAWSClient(object):
     LAMBDA_CREATE_ATTEMPTS = 30
     DELAY_TIME = 5
 
-    def __init__(self, session, sleep=time.sleep):
-        # type: (botocore.session.Session, Callable[[int], None]) -> None
+    def __init__(self,
+                 session,           # type: botocore.session.Session
+                 sleep=time.sleep,  # type: Callable[[int], None]
+                 config=None,       # type: _OPT_CONFIG
+                 ):
+        # type: (...) -> None
         self._session = session
         self._sleep = sleep
+        self._config = config
         self._client_cache = {}  # type: Dict[str, Any]
 
     def lambda_function_exists(self, name):
@@ -94,6 +102,24 @@ class TypedAWSClient(object):
         except client.exceptions.ResourceNotFoundException:
             return False
 
+    def list_function_names(self, max_pages=None):
+        # type: (Optional[int]) -> Optional[Set[str]]
+        """Return the names of all lambda functions in the region.
+
+        If ``max_pages`` is provided and the functions don't fit in
+        that many pages of results, None is returned instead.
+
+        """
+        paginator = self._client('lambda').get_paginator('list_functions')
+        names = set()  # type: Set[str]
+        for page_count, page in enumerate(paginator.paginate(), 1):
+            for function in page['Functions']:
+                names.add(function['FunctionName'])
+            if max_pages is not None and page_count >= max_pages and \
+                    'NextMarker' in page:
+                return None
+        return names
+
     def get_function_configuration(self, name):
         # type: (str) -> Dict[str, Any]
         response = self._client('lambda').get_function_configuration(
@@ -347,7 +373,7 @@ class TypedAWSClient(object):
         # type: (Dict[str, Any]) -> str
         client = self._client('apigateway')
         response = client.import_rest_api(
-            body=json.dumps(swagger_document, indent=2)
+            body=json_dumps_compact(swagger_document)
         )
         rest_api_id = response['id']
         return rest_api_id
@@ -358,7 +384,7 @@ class TypedAWSClient(object):
         client.put_rest_api(
             restApiId=rest_api_id,
             mode='overwrite',
-            body=json.dumps(swagger_document, indent=2))
+            body=json_dumps_compact(swagger_document))
 
     def delete_rest_api(self, rest_api_id):
         # type: (str) -> None
@@ -565,12 +591,13 @@ class TypedAWSClient(object):
         # type: (str) -> Any
         if service_name not in self._client_cache:
             self._client_cache[service_name] = self._session.create_client(
-                service_name)
+                service_name, config=self._config)
         return self._client_cache[service_name]
 
     def add_permission_for_authorizer(self, rest_api_id, function_arn,
-                                      random_id=None):
-        # type: (str, str, Optional[str]) -> None
+                                      random_id=None,
+                                      previous_source_arn=None):
+        # type: (str, str, Optional[str], Optional[str]) -> str
         client = self._client('apigateway')
         # This is actually a paginated operation, but botocore does not
         # support this style of pagination right now.  The max authorizers
@@ -591,6 +618,9 @@ class TypedAWSClient(object):
         function_name = parts[-1]
         source_arn = ("arn:aws:execute-api:%s:%s:%s/authorizers/%s" %
                       (region_name, account_id, rest_api_id, authorizer_id))
+        if source_arn == previous_source_arn:
+            # The permission was already added for this authorizer.
+            return source_arn
         if random_id is None:
             random_id = self._random_id()
         self._client('lambda').add_permission(
@@ -600,6 +630,7 @@ class TypedAWSClient(object):
             Principal='apigateway.amazonaws.com',
             SourceArn=source_arn,
         )
+        return source_arn
 
     def _random_id(self):
         # type: () -> str
@@ -100,11 +100,13 @@ def local(ctx, port=8000):
               help=('Name of the Chalice stage to deploy to. '
                     'Specifying a new chalice stage will create '
                     'an entirely new set of AWS resources.'))
+@click.option('--parallel/--no-parallel', default=True,
+              help='Make independent AWS calls concurrently.')
 @click.argument('deprecated-api-gateway-stage', nargs=1, required=False)
 @click.pass_context
 def deploy(ctx, autogen_policy, profile, api_gateway_stage, stage,
-           deprecated_api_gateway_stage):
-    # type: (click.Context, Optional[bool], str, str, str, str) -> None
+           parallel, deprecated_api_gateway_stage):
+    # type: (click.Context, Optional[bool], str, str, str, bool, str) -> None
     if api_gateway_stage is not None and \
             deprecated_api_gateway_stage is not None:
         raise _create_deprecated_stage_error(api_gateway_stage,
@@ -122,7 +124,8 @@ def deploy(ctx, autogen_policy, profile, api_gateway_stage, stage,
         api_gateway_stage=api_gateway_stage,
     )
     session = factory.create_botocore_session()
-    d = factory.create_default_deployer(session=session, prompter=click)
+    d = factory.create_default_deployer(session=session, prompter=click,
+                                        parallel_deploy=parallel)
     deployed_values = d.deploy(config, chalice_stage_name=stage)
     record_deployed_values(deployed_values, os.path.join(
         config.project_dir, '.chalice', 'deployed.json'))
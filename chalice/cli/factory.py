@@ -79,10 +79,12 @@ class CLIFactory(object):
         return create_botocore_session(profile=self.profile,
                                        debug=self.debug)
 
-    def create_default_deployer(self, session, prompter):
-        # type: (Session, deployer.NoPrompt) -> deployer.Deployer
+    def create_default_deployer(self, session, prompter,
+                                parallel_deploy=True):
+        # type: (Session, deployer.NoPrompt, bool) -> deployer.Deployer
         return deployer.create_default_deployer(
-            session=session, prompter=prompter)
+            session=session, prompter=prompter,
+            parallel_deploy=parallel_deploy)
 
     def create_config_obj(self, chalice_stage_name=DEFAULT_STAGE_NAME,
                           autogen_policy=None, api_gateway_stage=None):
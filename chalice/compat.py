@@ -1,7 +1,9 @@
+import json
 import os
 import platform
 import socket
 import six
+from typing import Any, Union  # noqa
 
 
 if six.PY3:
@@ -23,6 +25,52 @@ else:
         return isinstance(error, socket.error) and 'Broken pipe' in str(error)
 
 
+def _encode_utf8(dumped):
+    # type: (Union[str, bytes]) -> bytes
+    # On python2, json.dumps() returns a byte str unless the value
+    # contains unicode strings.
+    if isinstance(dumped, bytes):
+        return dumped
+    return dumped.encode('utf-8')
+
+
+try:
+    # orjson is an optional dependency, installed with the 'orjson'
+    # extra.  When it's installed we use it for the JSON documents we
+    # read and write on every deploy.  Both implementations write
+    # non-ASCII characters as UTF-8 rather than escaping them, so files
+    # on disk don't churn based on what's installed.
+    import orjson
+
+    def json_loads(data):
+        # type: (Union[str, bytes]) -> Any
+        return orjson.loads(data)
+
+    def json_dumps_indented(value):
+        # type: (Any) -> bytes
+        return orjson.dumps(
+            value, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+
+    def json_dumps_compact(value):
+        # type: (Any) -> bytes
+        return orjson.dumps(value)
+except ImportError:
+    def json_loads(data):
+        # type: (Union[str, bytes]) -> Any
+        return json.loads(data)
+
+    def json_dumps_indented(value):
+        # type: (Any) -> bytes
+        return _encode_utf8(json.dumps(
+            value, indent=2, separators=(',', ': '), sort_keys=True,
+            ensure_ascii=False))
+
+    def json_dumps_compact(value):
+        # type: (Any) -> bytes
+        return _encode_utf8(json.dumps(
+            value, separators=(',', ':'), ensure_ascii=False))
+
+
 if platform.system() == 'Windows':
     def pip_script_in_venv(venv_dir):
         # type: (str) -> str
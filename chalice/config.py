@@ -298,8 +298,9 @@ class Config(object):
 class DeployedResources(object):
     def __init__(self, backend, api_handler_arn,
                  api_handler_name, rest_api_id, api_gateway_stage,
-                 region, chalice_version, lambda_functions):
-        # type: (str, str, str, str, str, str, str, StrMap) -> None
+                 region, chalice_version, lambda_functions,
+                 apigw_permissions=None):
+        # type: (str, str, str, str, str, str, str, StrMap, StrMap) -> None
         self.backend = backend
         self.api_handler_arn = api_handler_arn
         self.api_handler_name = api_handler_name
@@ -308,6 +309,11 @@ class DeployedResources(object):
         self.region = region
         self.chalice_version = chalice_version
         self.lambda_functions = lambda_functions
+        if apigw_permissions is None:
+            apigw_permissions = {}
+        # Maps authorizer function ARNs to the source ARN API gateway
+        # was given permission to invoke them from.
+        self.apigw_permissions = apigw_permissions
 
     @classmethod
     def from_dict(cls, data):
@@ -324,4 +330,5 @@ class DeployedResources(object):
             # the 'lambda_functions' key, so we have
             # to default this if it's missing.
             data.get('lambda_functions', {}),
+            data.get('apigw_permissions', {}),
         )
@@ -51,6 +51,11 @@ DEFAULT_STAGE_NAME = 'dev'
 DEFAULT_LAMBDA_TIMEOUT = 60
 DEFAULT_LAMBDA_MEMORY_SIZE = 128
 MAX_LAMBDA_DEPLOYMENT_SIZE = 50 * (1024 ** 2)
+# The size of the botocore connection pool used by the deployer.
+# This needs to be large enough to accommodate all the threads
+# making concurrent API calls, otherwise connections are discarded
+# and have to be re-established for subsequent requests.
+DEPLOYER_MAX_POOL_CONNECTIONS = 50
 # This is the name of the main handler used to
 # handle API gateway requests.  This is used as a key
 # in the config module.
@@ -4,6 +4,7 @@ Handles Lambda and API Gateway deployments.
 
 """
 from __future__ import print_function
+import hashlib
 import json
 import os
 import textwrap
@@ -13,14 +14,17 @@ import uuid
 import warnings
 
 import botocore.session  # noqa
+import botocore.config
 from botocore.vendored.requests import ConnectionError as \
     RequestsConnectionError
 from typing import Any, Tuple, Callable, List, Dict, Optional  # noqa
+from typing import Iterable, Set  # noqa
 
 from chalice import app  # noqa
 from chalice import __version__ as chalice_version
 from chalice import policy
 from chalice.compat import is_broken_pipe_error
+from chalice.compat import json_loads, json_dumps_indented
 from chalice.awsclient import TypedAWSClient, ResourceDoesNotExistError
 from chalice.awsclient import DeploymentPackageTooLargeError
 from chalice.awsclient import LambdaClientError
@@ -32,12 +36,32 @@ from chalice.constants import DEFAULT_STAGE_NAME, LAMBDA_TRUST_POLICY
 from chalice.constants import DEFAULT_LAMBDA_TIMEOUT
 from chalice.constants import DEFAULT_LAMBDA_MEMORY_SIZE
 from chalice.constants import MAX_LAMBDA_DEPLOYMENT_SIZE
+from chalice.constants import DEPLOYER_MAX_POOL_CONNECTIONS
 from chalice.policy import AppPolicyGenerator
 
 
 NULLARY = Callable[[], str]
 OPT_RESOURCES = Optional[DeployedResources]
 OPT_STR = Optional[str]
+POLICY_FILE_KEY = Tuple[str, str, OPT_STR]
+# A client method along with the arguments to call it with.
+CLIENT_CALL = Tuple[Callable[..., Any], Tuple[Any, ...]]
+# Maximum number of auth handler lambda functions deployed concurrently.
+MAX_AUTH_HANDLER_WORKERS = 10
+# Maximum number of lambda functions deleted concurrently.
+MAX_DELETE_WORKERS = 8
+# Maximum number of lambda permissions added concurrently.
+MAX_PERMISSION_WORKERS = 8
+# Minimum number of lambda functions a deploy needs to check for before
+# listing every function in the region instead of checking each one.
+MIN_FUNCTIONS_TO_LIST = 5
+
+
+_ONE_MB = 1024.0 * 1024.0
+
+# Maps an indent string to the TextWrapper used to format
+# ChaliceDeploymentError messages with that indent.
+_WRAPPER_CACHE = {}  # type: Dict[str, textwrap.TextWrapper]
 
 
 _AWSCLIENT_EXCEPTIONS = (
@@ -45,19 +69,23 @@ _AWSCLIENT_EXCEPTIONS = (
 )
 
 
-def create_default_deployer(session, prompter=None):
-    # type: (botocore.session.Session, NoPrompt) -> Deployer
+def create_default_deployer(session, prompter=None, parallel_deploy=True):
+    # type: (botocore.session.Session, NoPrompt, bool) -> Deployer
     if prompter is None:
         prompter = NoPrompt()
-    aws_client = TypedAWSClient(session)
-    api_gateway_deploy = APIGatewayDeployer(aws_client)
+    client_config = botocore.config.Config(
+        max_pool_connections=DEPLOYER_MAX_POOL_CONNECTIONS)
+    aws_client = TypedAWSClient(session, config=client_config)
+    api_gateway_deploy = APIGatewayDeployer(
+        aws_client, parallel_deploy=parallel_deploy)
 
     packager = LambdaDeploymentPackager()
     osutils = OSUtils()
     lambda_deploy = LambdaDeployer(
         aws_client, packager, prompter, osutils,
         ApplicationPolicyHandler(
-            osutils, AppPolicyGenerator(osutils)))
+            osutils, AppPolicyGenerator(osutils)),
+        parallel_deploy=parallel_deploy)
     return Deployer(api_gateway_deploy, lambda_deploy)
 
 
@@ -85,10 +113,16 @@ def validate_routes(routes):
     # We check for:
     #
     # * any routes that end with a trailing slash.
+    #
+    # All the offending routes are reported at once so they can be
+    # fixed in a single pass.
+    trailing_slash_routes = sorted(
+        route_name for route_name in routes
+        if route_name != '/' and route_name.endswith('/'))
+    if trailing_slash_routes:
+        raise ValueError("Route cannot end with a trailing slash: %s"
+                         % ', '.join(trailing_slash_routes))
     for route_name, methods in routes.items():
-        if route_name != '/' and route_name.endswith('/'):
-            raise ValueError("Route cannot end with a trailing slash: %s"
-                             % route_name)
         _validate_cors_for_route(route_name, methods)
 
 
@@ -119,52 +153,64 @@ def validate_python_version(config, actual_py_version=None):
 
 
 def validate_route_content_types(routes, binary_types):
-    # type: (Dict[str, Dict[str, app.RouteEntry]], List[str]) -> None
+    # type: (Dict[str, Dict[str, app.RouteEntry]], Iterable[str]) -> None
+    binary_set = set(binary_types)
     for methods in routes.values():
         for route_entry in methods.values():
-            _validate_entry_content_type(route_entry, binary_types)
+            _validate_entry_content_type(route_entry, binary_set)
 
 
 def _validate_entry_content_type(route_entry, binary_types):
-    # type: (app.RouteEntry, List[str]) -> None
+    # type: (app.RouteEntry, Set[str]) -> None
+    content_types = route_entry.content_types
+    if binary_types.isdisjoint(content_types) or \
+            binary_types.issuperset(content_types):
+        return
     binary, non_binary = [], []
-    for content_type in route_entry.content_types:
+    for content_type in content_types:
         if content_type in binary_types:
             binary.append(content_type)
         else:
             non_binary.append(content_type)
-    if binary and non_binary:
-        # A routes content_types be homogeneous in their binary support.
-        raise ValueError(
-            'In view function "%s", the content_types %s support binary '
-            'and %s do not. All content_types must be consistent in their '
-            'binary support.' % (route_entry.view_name, binary, non_binary))
+    # A routes content_types be homogeneous in their binary support.
+    raise ValueError(
+        'In view function "%s", the content_types %s support binary '
+        'and %s do not. All content_types must be consistent in their '
+        'binary support.' % (route_entry.view_name, binary, non_binary))
 
 
 def _validate_cors_for_route(route_url, route_methods):
     # type: (str, Dict[str, app.RouteEntry]) -> None
-    entries_with_cors = [
-        entry for entry in route_methods.values() if entry.cors
-    ]
-    if entries_with_cors:
-        # If the user has enabled CORS, they can't also have an OPTIONS
-        # method because we'll create one for them.  API gateway will
-        # raise an error about duplicate methods.
-        if 'OPTIONS' in route_methods:
-            raise ValueError(
-                "Route entry cannot have both cors=True and "
-                "methods=['OPTIONS', ...] configured.  When "
-                "CORS is enabled, an OPTIONS method is automatically "
-                "added for you.  Please remove 'OPTIONS' from the list of "
-                "configured HTTP methods for: %s" % route_url)
-
-        if not all(entries_with_cors[0].cors == entry.cors for entry in
-                   entries_with_cors):
-            raise ValueError(
-                "Route may not have multiple differing CORS configurations. "
-                "Please ensure all views for \"%s\" that have CORS configured "
-                "have the same CORS configuration." % route_url
-            )
+    first_cors = None  # type: Optional[app.CORSConfig]
+    has_differing_cors = False
+    for entry in route_methods.values():
+        if not entry.cors:
+            continue
+        if first_cors is None:
+            first_cors = entry.cors
+        elif not first_cors == entry.cors:
+            # CORSConfig only defines __eq__, which doesn't give it a
+            # matching __ne__ on python 2, so != can't be used here.
+            has_differing_cors = True
+            break
+    if first_cors is None:
+        return
+    # If the user has enabled CORS, they can't also have an OPTIONS
+    # method because we'll create one for them.  API gateway will
+    # raise an error about duplicate methods.
+    if 'OPTIONS' in route_methods:
+        raise ValueError(
+            "Route entry cannot have both cors=True and "
+            "methods=['OPTIONS', ...] configured.  When "
+            "CORS is enabled, an OPTIONS method is automatically "
+            "added for you.  Please remove 'OPTIONS' from the list of "
+            "configured HTTP methods for: %s" % route_url)
+    if has_differing_cors:
+        raise ValueError(
+            "Route may not have multiple differing CORS configurations. "
+            "Please ensure all views for \"%s\" that have CORS configured "
+            "have the same CORS configuration." % route_url
+        )
 
 
 def _validate_manage_iam_role(config):
@@ -233,8 +279,16 @@ class ChaliceDeploymentError(Exception):
         #     urllib3.exceptions.ProtocolError(
         #         'Connection aborted.', <SomeException>)
         # )
-        message = connection_error.args[0].args[0]
-        underlying_error = connection_error.args[0].args[1]
+        #
+        # If the error doesn't have this structure we fall back to the
+        # error message itself rather than masking the original error
+        # with an IndexError.
+        if not connection_error.args:
+            return str(connection_error)
+        inner_args = getattr(connection_error.args[0], 'args', ())
+        if len(inner_args) < 2:
+            return str(connection_error)
+        message, underlying_error = inner_args[0], inner_args[1]
 
         if is_broken_pipe_error(underlying_error):
             message += (
@@ -269,12 +323,14 @@ class ChaliceDeploymentError(Exception):
 
     def _wrap_text(self, text, indent=''):
         # type: (str, str) -> str
-        return '\n'.join(
-            textwrap.wrap(
-                text, 79, replace_whitespace=False, drop_whitespace=False,
+        wrapper = _WRAPPER_CACHE.get(indent)
+        if wrapper is None:
+            wrapper = textwrap.TextWrapper(
+                width=79, replace_whitespace=False, drop_whitespace=False,
                 initial_indent=indent, subsequent_indent=indent
             )
-        )
+            _WRAPPER_CACHE[indent] = wrapper
+        return '\n'.join(wrapper.wrap(text))
 
     def _get_verb_from_client_method(self, client_method_name):
         # type: (str) -> str
@@ -287,7 +343,7 @@ class ChaliceDeploymentError(Exception):
 
     def _get_mb(self, value):
         # type: (int) -> str
-        return '%.1f MB' % (float(value) / (1024 ** 2))
+        return '%.1f MB' % (value / _ONE_MB)
 
 
 class NoPrompt(object):
@@ -365,6 +421,7 @@ class LambdaDeployer(object):
                  prompter,     # type: NoPrompt
                  osutils,      # type: OSUtils
                  app_policy,   # type: ApplicationPolicyHandler
+                 parallel_deploy=True,  # type: bool
                  ):
         # type: (...) -> None
         self._aws_client = aws_client
@@ -372,6 +429,21 @@ class LambdaDeployer(object):
         self._prompter = prompter
         self._osutils = osutils
         self._app_policy = app_policy
+        self._parallel_deploy = parallel_deploy
+        # Maps deployment package filenames to a read only memory map
+        # of their contents so the same package isn't copied into memory
+        # once per lambda function.
+        self._zip_cache = {}  # type: Dict[str, Any]
+        # Maps role names to role ARNs.  This ensures we only look up
+        # (and update the policy of) each role once per deploy.
+        self._role_arn_cache = {}  # type: Dict[str, str]
+        # Maps project dirs to their deployment package filename, which
+        # requires hashing the app's requirements and vendor dir.
+        self._package_filename_cache = {}  # type: Dict[str, str]
+        # The names of all the lambda functions in the region, only
+        # fetched when a deploy has enough functions to check that
+        # listing them is cheaper than checking each one.
+        self._existing_function_names = None  # type: Optional[Set[str]]
 
     def delete(self, existing_resources):
         # type: (DeployedResources) -> None
@@ -397,11 +469,27 @@ class LambdaDeployer(object):
         # type: (DeployedResources) -> None
         if not existing_resources.lambda_functions:
             return
-        for function_arn in existing_resources.lambda_functions.values():
-            # We could use the key names, but we're using the
-            # Lambda ARNs to ensure we have the right lambda
-            # function.
-            self._delete_lambda_function(function_arn)
+        # We could use the key names, but we're using the
+        # Lambda ARNs to ensure we have the right lambda
+        # function.
+        self._delete_lambda_functions(
+            list(existing_resources.lambda_functions.values()))
+
+    def _delete_lambda_functions(self, function_arns):
+        # type: (List[str]) -> None
+        if not self._parallel_deploy or len(function_arns) <= 1:
+            for function_arn in function_arns:
+                self._delete_lambda_function(function_arn)
+            return
+        # concurrent.futures is imported here rather than at the module
+        # level because this module is imported on every CLI invocation,
+        # and importing it also pulls in multiprocessing.
+        from concurrent.futures import ThreadPoolExecutor
+        max_workers = min(MAX_DELETE_WORKERS, len(function_arns))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Consuming the results re-raises any unexpected
+            # exception from the worker threads.
+            list(executor.map(self._delete_lambda_function, function_arns))
 
     def _delete_lambda_function(self, function_name_or_arn):
         # type: (str) -> None
@@ -414,30 +502,86 @@ class LambdaDeployer(object):
     def deploy(self, config, existing_resources, stage_name):
         # type: (Config, OPT_RESOURCES, str) -> Dict[str, Any]
         deployed_values = {}  # type: Dict[str, Any]
-        self._deploy_api_handler(config, existing_resources, stage_name,
-                                 deployed_values)
-        self._deploy_auth_handlers(config, existing_resources, stage_name,
-                                   deployed_values)
+        function_count = len(config.chalice_app.builtin_auth_handlers)
+        if existing_resources is not None:
+            function_count += 1
+        try:
+            self._list_existing_functions(function_count)
+            self._deploy_api_handler(config, existing_resources, stage_name,
+                                     deployed_values)
+            self._deploy_auth_handlers(config, existing_resources,
+                                       stage_name, deployed_values)
+        finally:
+            for filename in list(self._zip_cache):
+                self._invalidate_deployment_package(filename)
+            self._role_arn_cache.clear()
+            self._package_filename_cache.clear()
+            self._existing_function_names = None
         if existing_resources is not None:
             self._cleanup_unreferenced_functions(existing_resources,
                                                  deployed_values)
         return deployed_values
 
+    def _read_deployment_package(self, filename):
+        # type: (str) -> Any
+        if filename not in self._zip_cache:
+            self._zip_cache[filename] = self._osutils.mmap_file_contents(
+                filename)
+        return self._zip_cache[filename]
+
+    def _list_existing_functions(self, function_count):
+        # type: (int) -> None
+        # Listing functions takes a call for every 50 functions in the
+        # region and requires the lambda:ListFunctions permission, so
+        # it's only used when there's enough functions to check.  If
+        # the region has too many functions to list in fewer calls than
+        # checking each function, they're checked individually instead.
+        if function_count < MIN_FUNCTIONS_TO_LIST:
+            return
+        try:
+            self._existing_function_names = \
+                self._aws_client.list_function_names(
+                    max_pages=function_count - 1)
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error'].get('Code') != 'AccessDeniedException':
+                raise
+
+    def _function_exists(self, function_name):
+        # type: (str) -> bool
+        if self._existing_function_names is not None:
+            return function_name in self._existing_function_names
+        return self._aws_client.lambda_function_exists(function_name)
+
+    def _deployment_package_filename(self, project_dir):
+        # type: (str) -> str
+        if project_dir not in self._package_filename_cache:
+            self._package_filename_cache[project_dir] = \
+                self._packager.deployment_package_filename(project_dir)
+        return self._package_filename_cache[project_dir]
+
+    def _invalidate_deployment_package(self, filename):
+        # type: (str) -> None
+        # Closes and discards any cached contents of a deployment package
+        # that's been modified on disk.  Where possible this should be
+        # called before the package is modified, some platforms don't
+        # allow replacing a file that's memory mapped.
+        contents = self._zip_cache.pop(filename, None)
+        if contents is not None:
+            contents.close()
+
     def _cleanup_unreferenced_functions(self, existing_resources,
                                         deployed_values):
         # type: (DeployedResources, Dict[str, Any]) -> None
-        unreferenced = (
-            set(existing_resources.lambda_functions.values()) -
-            set(deployed_values['lambda_functions'].values()))
-        for function_arn in unreferenced:
-            self._delete_lambda_function(function_arn)
+        unreferenced = set(
+            existing_resources.lambda_functions.values()).difference(
+                deployed_values['lambda_functions'].values())
+        self._delete_lambda_functions(list(unreferenced))
 
     def _deploy_api_handler(self, config, existing_resources, stage_name,
                             deployed_values):
         # type: (Config, OPT_RESOURCES, str, Dict[str, Any]) -> None
         if existing_resources is not None and \
-                self._aws_client.lambda_function_exists(
-                    existing_resources.api_handler_name):
+                self._function_exists(existing_resources.api_handler_name):
             handler_name = existing_resources.api_handler_name
             self._confirm_any_runtime_changes(config, handler_name)
             self._get_or_create_lambda_role_arn(config, handler_name)
@@ -458,28 +602,76 @@ class LambdaDeployer(object):
         # has already been called.  As a result, it reused portions of that
         # functions configuration:
         auth_handlers = config.chalice_app.builtin_auth_handlers
+        lambda_functions = {}  # type: Dict[str, str]
+        deployed_values['lambda_functions'] = lambda_functions
         if not auth_handlers:
-            deployed_values['lambda_functions'] = {}
             return
+        # Every auth handler shares the API handler's deployment package,
+        # so it's only read once.  Roles are resolved for each auth
+        # handler's scoped config before deploying, which means the
+        # worker threads below never prompt the user or modify the
+        # deployment package.  A managed role is the API handler's role,
+        # so it's only looked up once.
+        api_handler_name = deployed_values['api_handler_name']
+        zip_contents = self._read_deployment_package(
+            self._deployment_package_filename(config.project_dir))
+        tasks = []  # type: List[Tuple[Any, ...]]
         for auth_config in auth_handlers:
             new_config = config.scope(chalice_stage=config.chalice_stage,
                                       function_name=auth_config.name)
-            self._deploy_auth_handler(
-                new_config, auth_config, stage_name, deployed_values)
+            role_arn = self._get_or_create_lambda_role_arn(
+                new_config, api_handler_name)
+            tasks.append((new_config, auth_config, api_handler_name,
+                          role_arn, zip_contents))
+        if not self._parallel_deploy or len(tasks) == 1:
+            results = [self._deploy_auth_handler(*task) for task in tasks]
+        else:
+            results = self._deploy_auth_handlers_concurrently(tasks)
+        preexisting_names = set()  # type: Set[str]
+        for function_name, function_arn, existed in results:
+            lambda_functions[function_name] = function_arn
+            if existed:
+                preexisting_names.add(function_name)
+        # Permissions for API gateway to invoke an auth handler are only
+        # carried over from the previous deploy if the function already
+        # existed.  A function that's been recreated has lost them.
+        previous_permissions = {}  # type: Dict[str, str]
+        if existing_resources is not None:
+            previous_permissions = existing_resources.apigw_permissions
+        deployed_values['apigw_permissions'] = {
+            function_arn: previous_permissions[function_arn]
+            for function_name, function_arn in lambda_functions.items()
+            if function_name in preexisting_names and
+            function_arn in previous_permissions
+        }
 
-    def _deploy_auth_handler(self, config, auth_config,
-                             stage_name, deployed_values):
-        # type: (Config, app.BuiltinAuthConfig, str, Dict[str, Any]) -> None
-        api_handler_name = deployed_values['api_handler_name']
-        role_arn = self._get_or_create_lambda_role_arn(
-            config, api_handler_name)
-        zip_contents = self._osutils.get_file_contents(
-            self._packager.deployment_package_filename(config.project_dir),
-            binary=True)
+    def _deploy_auth_handlers_concurrently(self, tasks):
+        # type: (List[Tuple[Any, ...]]) -> List[Tuple[str, str, bool]]
+        from concurrent.futures import ThreadPoolExecutor
+        max_workers = min(MAX_AUTH_HANDLER_WORKERS, len(tasks))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._deploy_auth_handler, *task)
+                       for task in tasks]
+            # Results are collected on this thread in the order the
+            # tasks were submitted, so no locking is needed and the
+            # deployed functions are recorded in a stable order.
+            return [future.result() for future in futures]
+
+    def _deploy_auth_handler(self,
+                             config,            # type: Config
+                             auth_config,       # type: app.BuiltinAuthConfig
+                             api_handler_name,  # type: str
+                             role_arn,          # type: str
+                             zip_contents,      # type: Any
+                             ):
+        # type: (...) -> Tuple[str, str, bool]
+        # Returns the function's name and ARN, and whether the function
+        # already existed.
         function_name = api_handler_name + '-' + auth_config.name
-        if self._aws_client.lambda_function_exists(function_name):
-            response = self._update_lambda_function(
-                config, function_name, stage_name)
+        existed = self._function_exists(function_name)
+        if existed:
+            response = self._send_lambda_update(
+                config, function_name, zip_contents, role_arn)
             function_arn = response['FunctionArn']
         else:
             function_arn = self._aws_client.create_function(
@@ -493,8 +685,7 @@ class LambdaDeployer(object):
                 timeout=self._get_lambda_timeout(config),
                 memory_size=self._get_lambda_memory_size(config),
             )
-        deployed_values.setdefault(
-            'lambda_functions', {})[function_name] = function_arn
+        return function_name, function_arn, existed
 
     def _confirm_any_runtime_changes(self, config, handler_name):
         # type: (Config, str) -> None
@@ -525,13 +716,22 @@ class LambdaDeployer(object):
             # an iam_role_arn.
             return config.iam_role_arn
 
-        try:
-            # We're using the lambda function_name as the role_name.
-            role_arn = self._aws_client.get_role_arn_for_name(role_name)
+        if role_name in self._role_arn_cache:
+            return self._role_arn_cache[role_name]
+        # We're using the lambda function_name as the role_name.
+        return self._update_or_create_lambda_role(
+            config, role_name, self._get_lambda_role_arn(role_name))
+
+    def _update_or_create_lambda_role(self, config, role_name, role_arn):
+        # type: (Config, str, Optional[str]) -> str
+        # This may prompt the user, so it's only called from the
+        # main thread.
+        if role_arn is not None:
             self._update_role_with_latest_policy(role_name, config)
-        except ResourceDoesNotExistError:
+        else:
             print("Creating role")
             role_arn = self._create_role_from_source_code(config, role_name)
+        self._role_arn_cache[role_name] = role_arn
         return role_arn
 
     def _update_role_with_latest_policy(self, app_name, config):
@@ -544,13 +744,11 @@ class LambdaDeployer(object):
             if diff.get('added', set([])):
                 print("\nThe following actions will be added to "
                       "the execution policy:\n")
-                for action in diff['added']:
-                    print(action)
+                print('\n'.join(diff['added']))
             if diff.get('removed', set([])):
                 print("\nThe following action will be removed from "
                       "the execution policy:\n")
-                for action in diff['removed']:
-                    print(action)
+                print('\n'.join(diff['removed']))
             self._prompter.confirm("\nWould you like to continue? ",
                                    default=True, abort=True)
         self._aws_client.delete_role_policy(
@@ -566,13 +764,15 @@ class LambdaDeployer(object):
         # function arn.
         # First we need to create a deployment package.
         print("Initial creation of lambda function.")
-        role_arn = self._get_or_create_lambda_role_arn(config, function_name)
-        zip_filename = self._packager.create_deployment_package(
-            config.project_dir)
-        zip_contents = self._osutils.get_file_contents(
-            zip_filename, binary=True)
-
-        return self._aws_client.create_function(
+        # The package is about to be rebuilt on disk so any previously
+        # mapped contents need to be released first.
+        self._invalidate_deployment_package(
+            self._deployment_package_filename(config.project_dir))
+        role_arn, zip_filename = self._create_role_and_deployment_package(
+            config, function_name)
+        zip_contents = self._read_deployment_package(zip_filename)
+
+        function_arn = self._aws_client.create_function(
             function_name=function_name,
             role_arn=role_arn,
             zip_contents=zip_contents,
@@ -583,6 +783,31 @@ class LambdaDeployer(object):
             timeout=self._get_lambda_timeout(config),
             memory_size=self._get_lambda_memory_size(config)
         )
+        return function_arn
+
+    def _create_role_and_deployment_package(self, config, function_name):
+        # type: (Config, str) -> Tuple[str, str]
+        if not self._parallel_deploy or not config.manage_iam_role or \
+                function_name in self._role_arn_cache:
+            role_arn = self._get_or_create_lambda_role_arn(
+                config, function_name)
+            zip_filename = self._packager.create_deployment_package(
+                config.project_dir)
+            return role_arn, zip_filename
+        from concurrent.futures import ThreadPoolExecutor
+        # Only the role lookup happens in the background while the
+        # package is built.  Updating or creating the role can print the
+        # policy and prompt the user, so that waits until the packager
+        # is done writing its output.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            role_future = executor.submit(
+                self._get_lambda_role_arn, function_name)
+            zip_filename = self._packager.create_deployment_package(
+                config.project_dir)
+            existing_role_arn = role_future.result()
+        role_arn = self._update_or_create_lambda_role(
+            config, function_name, existing_role_arn)
+        return role_arn, zip_filename
 
     def _get_lambda_timeout(self, config):
         # type: (Config) -> int
@@ -601,17 +826,26 @@ class LambdaDeployer(object):
         print("Updating lambda function...")
         project_dir = config.project_dir
         packager = self._packager
-        deployment_package_filename = packager.deployment_package_filename(
+        deployment_package_filename = self._deployment_package_filename(
             project_dir)
+        # The package is about to be modified on disk so any previously
+        # read contents are stale.
+        self._invalidate_deployment_package(deployment_package_filename)
         if self._osutils.file_exists(deployment_package_filename):
             packager.inject_latest_app(deployment_package_filename,
                                        project_dir)
         else:
             deployment_package_filename = packager.create_deployment_package(
                 project_dir)
-        zip_contents = self._osutils.get_file_contents(
-            deployment_package_filename, binary=True)
+        zip_contents = self._read_deployment_package(
+            deployment_package_filename)
         role_arn = self._get_or_create_lambda_role_arn(config, lambda_name)
+        return self._send_lambda_update(
+            config, lambda_name, zip_contents, role_arn)
+
+    def _send_lambda_update(self, config, lambda_name, zip_contents,
+                            role_arn):
+        # type: (Config, str, Any, str) -> Dict[str, Any]
         print("Sending changes to lambda.")
         return self._aws_client.update_function(
             function_name=lambda_name,
@@ -649,9 +883,10 @@ class LambdaDeployer(object):
 
 
 class APIGatewayDeployer(object):
-    def __init__(self, aws_client):
-        # type: (TypedAWSClient) -> None
+    def __init__(self, aws_client, parallel_deploy=True):
+        # type: (TypedAWSClient, bool) -> None
         self._aws_client = aws_client
+        self._parallel_deploy = parallel_deploy
 
     def delete(self, existing_resources):
         # type: (DeployedResources) -> None
@@ -664,20 +899,27 @@ class APIGatewayDeployer(object):
 
     def deploy(self, config, existing_resources, deployed_resources):
         # type: (Config, OPT_RESOURCES, Dict[str, Any]) -> Tuple[str, str, str]
+        region_name = self._aws_client.region_name
+        generator = SwaggerGenerator(region_name, deployed_resources)
         if existing_resources is not None and \
                 self._aws_client.rest_api_exists(
                     existing_resources.rest_api_id):
             print("API Gateway rest API already found.")
             rest_api_id = existing_resources.rest_api_id
             return self._create_resources_for_api(
-                config, rest_api_id, deployed_resources)
+                config, rest_api_id, deployed_resources, generator,
+                region_name)
         print("Initiating first time deployment...")
-        return self._first_time_deploy(config, deployed_resources)
-
-    def _first_time_deploy(self, config, deployed_resources):
-        # type: (Config, Dict[str, Any]) -> Tuple[str, str, str]
-        generator = SwaggerGenerator(self._aws_client.region_name,
-                                     deployed_resources)
+        return self._first_time_deploy(config, deployed_resources, generator,
+                                       region_name)
+
+    def _first_time_deploy(self,
+                           config,              # type: Config
+                           deployed_resources,  # type: Dict[str, Any]
+                           generator,           # type: SwaggerGenerator
+                           region_name,         # type: str
+                           ):
+        # type: (...) -> Tuple[str, str, str]
         swagger_doc = generator.generate_swagger(config.chalice_app)
         # The swagger_doc that's generated will contain the "name" which is
         # used to set the name for the restAPI.  API Gateway allows you
@@ -688,44 +930,78 @@ class APIGatewayDeployer(object):
         rest_api_id = self._aws_client.import_rest_api(swagger_doc)
         api_gateway_stage = config.api_gateway_stage or DEFAULT_STAGE_NAME
         self._deploy_api_to_stage(rest_api_id, api_gateway_stage,
-                                  deployed_resources)
-        return rest_api_id, self._aws_client.region_name, api_gateway_stage
-
-    def _create_resources_for_api(self, config, rest_api_id,
-                                  deployed_resources):
-        # type: (Config, str, Dict[str, Any]) -> Tuple[str, str, str]
-        generator = SwaggerGenerator(self._aws_client.region_name,
-                                     deployed_resources)
+                                  deployed_resources, region_name)
+        return rest_api_id, region_name, api_gateway_stage
+
+    def _create_resources_for_api(self,
+                                  config,              # type: Config
+                                  rest_api_id,         # type: str
+                                  deployed_resources,  # type: Dict[str, Any]
+                                  generator,           # type: SwaggerGenerator
+                                  region_name,         # type: str
+                                  ):
+        # type: (...) -> Tuple[str, str, str]
         swagger_doc = generator.generate_swagger(config.chalice_app)
         self._aws_client.update_api_from_swagger(rest_api_id, swagger_doc)
         api_gateway_stage = config.api_gateway_stage or DEFAULT_STAGE_NAME
         self._deploy_api_to_stage(
             rest_api_id, api_gateway_stage,
-            deployed_resources)
-        return rest_api_id, self._aws_client.region_name, api_gateway_stage
-
-    def _deploy_api_to_stage(self, rest_api_id, api_gateway_stage,
-                             deployed_resources):
-        # type: (str, str, Dict[str, Any]) -> None
+            deployed_resources, region_name)
+        return rest_api_id, region_name, api_gateway_stage
+
+    def _deploy_api_to_stage(self,
+                             rest_api_id,         # type: str
+                             api_gateway_stage,   # type: str
+                             deployed_resources,  # type: Dict[str, Any]
+                             region_name,         # type: str
+                             ):
+        # type: (...) -> None
         print("Deploying to: %s" % api_gateway_stage)
         self._aws_client.deploy_rest_api(rest_api_id, api_gateway_stage)
         api_handler_arn_parts = deployed_resources[
             'api_handler_arn'].split(':')
         function_name = api_handler_arn_parts[-1]
         account_id = api_handler_arn_parts[4]
-        self._aws_client.add_permission_for_apigateway_if_needed(
-            function_name,
-            self._aws_client.region_name,
-            account_id,
-            rest_api_id,
-            str(uuid.uuid4()),
-        )
+        # Assuming these are just authorizers for now.
         lambda_functions = deployed_resources.get('lambda_functions', {})
-        if lambda_functions:
-            # Assuming these are just authorizers for now.
-            for function_arn in lambda_functions.values():
-                self._aws_client.add_permission_for_authorizer(
-                    rest_api_id, function_arn, str(uuid.uuid4()))
+        previous_permissions = deployed_resources.get('apigw_permissions', {})
+        function_arns = list(lambda_functions.values())
+        # The random bytes for every statement ID are read from
+        # os.urandom at once instead of once per uuid.uuid4() call.
+        count = len(function_arns) + 1
+        entropy = os.urandom(16 * count)
+        statement_ids = [
+            uuid.UUID(bytes=entropy[i * 16:(i + 1) * 16], version=4).hex
+            for i in range(count)]
+        calls = []  # type: List[CLIENT_CALL]
+        calls.append((
+            self._aws_client.add_permission_for_apigateway_if_needed,
+            (function_name, region_name, account_id, rest_api_id,
+             statement_ids[0])))
+        for function_arn, statement_id in zip(function_arns,
+                                              statement_ids[1:]):
+            calls.append((
+                self._aws_client.add_permission_for_authorizer,
+                (rest_api_id, function_arn, statement_id,
+                 previous_permissions.get(function_arn))))
+        source_arns = self._add_permissions(calls)[1:]
+        deployed_resources['apigw_permissions'] = dict(
+            zip(function_arns, source_arns))
+
+    def _add_permissions(self, calls):
+        # type: (List[CLIENT_CALL]) -> List[Any]
+        # Each permission is independent of the others so they're
+        # added concurrently when there's more than one of them.
+        if not self._parallel_deploy or len(calls) <= 1:
+            return [method(*args) for method, args in calls]
+        from concurrent.futures import ThreadPoolExecutor
+        max_workers = min(MAX_PERMISSION_WORKERS, len(calls))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(method, *args)
+                       for method, args in calls]
+            # Consuming the results re-raises any exception from
+            # the worker threads.
+            return [future.result() for future in futures]
 
 
 class ApplicationPolicyHandler(object):
@@ -758,11 +1034,22 @@ class ApplicationPolicyHandler(object):
         'Version': '2012-10-17',
         'Statement': [],
     }
+    # Suffix of the file, stored next to the policy file, that records
+    # a hash of the app source the policy was generated from.
+    _SOURCE_HASH_SUFFIX = '.sha256'
 
     def __init__(self, osutils, policy_generator):
         # type: (OSUtils, AppPolicyGenerator) -> None
         self._osutils = osutils
         self._policy_gen = policy_generator
+        # Maps the config values that determine an app's policy file
+        # to the resolved filename.
+        self._policy_file_cache = {}  # type: Dict[POLICY_FILE_KEY, str]
+        # Maps policy filenames to the app source a policy was last
+        # generated from.  The user can be prompted between generating
+        # and recording a policy, so app.py may have changed on disk
+        # by the time it's recorded.
+        self._generated_from = {}  # type: Dict[str, bytes]
 
     def generate_policy_from_app_source(self, config):
         # type: (Config) -> Dict[str, Any]
@@ -781,42 +1068,87 @@ class ApplicationPolicyHandler(object):
 
     def _do_generate_from_source(self, config):
         # type: (Config) -> Dict[str, Any]
+        # If the last recorded policy was generated from the same app
+        # source, it's returned instead of analyzing the source again.
+        app_source = self._osutils.get_file_contents(
+            os.path.join(config.project_dir, 'app.py'), binary=True)
+        policy_file = self._app_policy_file(config)
+        self._generated_from[policy_file] = app_source
+        hash_file = policy_file + self._SOURCE_HASH_SUFFIX
+        if self._osutils.file_exists(policy_file) and \
+                self._osutils.file_exists(hash_file):
+            policy_contents = self._osutils.get_file_contents(
+                policy_file, binary=True)
+            source_hash = self._osutils.get_file_contents(
+                hash_file, binary=False)
+            if source_hash == self._source_hash(app_source,
+                                                policy_contents):
+                return json_loads(policy_contents)
         return self._policy_gen.generate_policy(config)
 
+    def _source_hash(self, app_source, policy_contents):
+        # type: (bytes, bytes) -> str
+        # The hash covers the policy file itself so that a hand edited
+        # policy file isn't mistaken for a generated one, and the chalice
+        # and botocore versions so an upgraded policy generator or
+        # service model always runs.
+        source_hash = hashlib.sha256(chalice_version.encode('utf-8'))
+        source_hash.update(botocore.__version__.encode('utf-8'))
+        source_hash.update(app_source)
+        source_hash.update(policy_contents)
+        return source_hash.hexdigest()
+
     def load_last_policy(self, config):
         # type: (Config) -> Dict[str, Any]
         """Load the last recorded policy file for the app."""
         filename = self._app_policy_file(config)
         if not self._osutils.file_exists(filename):
             return self._EMPTY_POLICY
-        return json.loads(
-            self._osutils.get_file_contents(filename, binary=False)
+        return json_loads(
+            self._osutils.get_file_contents(filename, binary=True)
         )
 
     def record_policy(self, config, policy_document):
         # type: (Config, Dict[str, Any]) -> None
         policy_file = self._app_policy_file(config)
+        policy_contents = json_dumps_indented(policy_document)
         self._osutils.set_file_contents(
             policy_file,
-            json.dumps(policy_document, indent=2, separators=(',', ': ')),
-            binary=False
+            policy_contents,
+            binary=True
         )
+        # The hash is only recorded for policies generated from the
+        # app source, using the source as it was when the policy was
+        # generated.
+        if config.autogen_policy and policy_file in self._generated_from:
+            app_source = self._generated_from.pop(policy_file)
+            self._osutils.set_file_contents(
+                policy_file + self._SOURCE_HASH_SUFFIX,
+                self._source_hash(app_source, policy_contents),
+                binary=False
+            )
 
     def _app_policy_file(self, config):
         # type: (Config) -> str
+        key = (config.project_dir, config.chalice_stage,
+               config.iam_policy_file)
+        if key not in self._policy_file_cache:
+            self._policy_file_cache[key] = self._find_app_policy_file(config)
+        return self._policy_file_cache[key]
+
+    def _find_app_policy_file(self, config):
+        # type: (Config) -> str
+        chalice_dir = os.path.join(config.project_dir, '.chalice')
         if config.iam_policy_file:
-            filename = os.path.join(config.project_dir, '.chalice',
-                                    config.iam_policy_file)
-        else:
-            # Otherwise if the user doesn't specify a file it defaults
-            # to a fixed name based on the stage.
-            basename = 'policy-%s.json' % config.chalice_stage
-            filename = os.path.join(config.project_dir, '.chalice', basename)
-            if not self._osutils.file_exists(filename) and \
-                    config.chalice_stage == DEFAULT_STAGE_NAME:
-                # There's a special back-compat case where we'll
-                # try to load .chalice/policy.json if you're using
-                # the default dev stage.
-                filename = os.path.join(config.project_dir,
-                                        '.chalice', 'policy.json')
+            return os.path.join(chalice_dir, config.iam_policy_file)
+        # Otherwise if the user doesn't specify a file it defaults
+        # to a fixed name based on the stage.
+        basename = 'policy-%s.json' % config.chalice_stage
+        filename = os.path.join(chalice_dir, basename)
+        if not self._osutils.file_exists(filename) and \
+                config.chalice_stage == DEFAULT_STAGE_NAME:
+            # There's a special back-compat case where we'll
+            # try to load .chalice/policy.json if you're using
+            # the default dev stage.
+            filename = os.path.join(chalice_dir, 'policy.json')
         return filename
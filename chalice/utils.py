@@ -1,4 +1,5 @@
 import os
+import mmap
 import zipfile
 import json
 
@@ -92,6 +93,19 @@ class OSUtils(object):
         with open(filename, mode) as f:
             return f.read()
 
+    def mmap_file_contents(self, filename):
+        # type: (str) -> mmap.mmap
+        """Return a read only memory map of a file's contents.
+
+        The returned object can be passed to botocore anywhere binary
+        file contents are accepted, without first reading the entire
+        file into memory.
+        The caller is responsible for closing the returned object.
+
+        """
+        with open(filename, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
     def set_file_contents(self, filename, contents, binary=True):
         # type: (str, str, bool) -> None
         if binary:
@@ -12,6 +12,7 @@ install_requires = [
     'virtualenv>=15.0.0,<16.0.0',
     'typing==3.5.3.0',
     'six>=1.10.0,<2.0.0',
+    'futures>=3.1.1,<4.0.0;python_version=="2.7"',
 ]
 
 setup(
@@ -24,6 +25,9 @@ setup(
     url='https://github.com/jamesls/chalice',
     packages=find_packages(exclude=['tests']),
     install_requires=install_requires,
+    extras_require={
+        'orjson': ['orjson;python_version>="3.6"'],
+    },
     license="Apache License 2.0",
     package_data={'chalice': ['*.json']},
     include_package_data=True,
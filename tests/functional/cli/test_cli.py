@@ -167,6 +167,20 @@ def test_can_deploy(runner, mock_cli_factory, mock_deployer):
             assert data == deployed_values
 
 
+def test_can_deploy_without_parallel_calls(runner, mock_cli_factory,
+                                           mock_deployer):
+    mock_deployer.deploy.return_value = {}
+    with runner.isolated_filesystem():
+        cli.create_new_project_skeleton('testproject')
+        os.chdir('testproject')
+        result = _run_cli_command(runner, cli.deploy, ['--no-parallel'],
+                                  cli_factory=mock_cli_factory)
+        assert result.exit_code == 0
+        mock_cli_factory.create_default_deployer.assert_called_with(
+            session=mock.sentinel.Session, prompter=mock.ANY,
+            parallel_deploy=False)
+
+
 def test_can_delete(runner, mock_cli_factory, mock_deployer):
     deployed_values = {
         'dev': {
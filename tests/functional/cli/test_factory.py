@@ -63,6 +63,13 @@ def test_can_create_default_deployer(clifactory):
     assert isinstance(deployer, Deployer)
 
 
+def test_can_create_deployer_without_parallel_calls(clifactory):
+    session = clifactory.create_botocore_session()
+    deployer = clifactory.create_default_deployer(
+        session, None, parallel_deploy=False)
+    assert isinstance(deployer, Deployer)
+
+
 def test_can_create_config_obj(clifactory):
     obj = clifactory.create_config_obj()
     assert isinstance(obj, Config)
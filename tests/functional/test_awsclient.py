@@ -4,6 +4,7 @@ import time
 
 import pytest
 import mock
+import botocore.config
 import botocore.exceptions
 from botocore.vendored.requests import ConnectionError as \
     RequestsConnectionError
@@ -19,6 +20,13 @@ def test_region_name_is_exposed(stubbed_session):
     assert TypedAWSClient(stubbed_session).region_name == 'us-west-2'
 
 
+def test_client_config_is_used_for_clients(stubbed_session):
+    config = botocore.config.Config(max_pool_connections=50)
+    awsclient = TypedAWSClient(stubbed_session, config=config)
+    client = awsclient._client('lambda')
+    assert client.meta.config.max_pool_connections == 50
+
+
 def test_deploy_rest_api(stubbed_session):
     stub_client = stubbed_session.stub('apigateway')
     stub_client.create_deployment(
@@ -152,6 +160,64 @@ class TestLambdaFunctionExists(object):
         stubbed_session.verify_stubs()
 
 
+class TestListFunctionNames(object):
+    def test_can_list_function_names(self, stubbed_session):
+        stubbed_session.stub('lambda').list_functions().returns({
+            'Functions': [{'FunctionName': 'foo'}],
+            'NextMarker': 'marker',
+        })
+        stubbed_session.stub('lambda').list_functions(
+            Marker='marker').returns({
+                'Functions': [{'FunctionName': 'bar'}],
+            })
+        stubbed_session.activate_stubs()
+
+        awsclient = TypedAWSClient(stubbed_session)
+        assert awsclient.list_function_names() == set(['foo', 'bar'])
+
+        stubbed_session.verify_stubs()
+
+    def test_list_stops_after_max_pages(self, stubbed_session):
+        stubbed_session.stub('lambda').list_functions().returns({
+            'Functions': [{'FunctionName': 'foo'}],
+            'NextMarker': 'marker',
+        })
+        stubbed_session.activate_stubs()
+
+        awsclient = TypedAWSClient(stubbed_session)
+        assert awsclient.list_function_names(max_pages=1) is None
+
+        stubbed_session.verify_stubs()
+
+    def test_can_list_all_pages_within_max_pages(self, stubbed_session):
+        stubbed_session.stub('lambda').list_functions().returns({
+            'Functions': [{'FunctionName': 'foo'}],
+            'NextMarker': 'marker',
+        })
+        stubbed_session.stub('lambda').list_functions(
+            Marker='marker').returns({
+                'Functions': [{'FunctionName': 'bar'}],
+            })
+        stubbed_session.activate_stubs()
+
+        awsclient = TypedAWSClient(stubbed_session)
+        assert awsclient.list_function_names(max_pages=2) == set(
+            ['foo', 'bar'])
+
+        stubbed_session.verify_stubs()
+
+    def test_no_functions_returns_empty_set(self, stubbed_session):
+        stubbed_session.stub('lambda').list_functions().returns({
+            'Functions': [],
+        })
+        stubbed_session.activate_stubs()
+
+        awsclient = TypedAWSClient(stubbed_session)
+        assert awsclient.list_function_names() == set()
+
+        stubbed_session.verify_stubs()
+
+
 class TestDeleteLambdaFunction(object):
     def test_lambda_delete_function(self, stubbed_session):
         stubbed_session.stub('lambda')\
@@ -1000,6 +1066,22 @@ class TestAddPermissionsForAuthorizer(object):
         )
         stubbed_session.verify_stubs()
 
+    def test_permission_not_added_if_source_arn_unchanged(self,
+                                                          stubbed_session):
+        stubbed_session.stub('apigateway').get_authorizers(
+            restApiId='rest-api-id').returns({
+                'items': [{'authorizerUri': self.GOOD_ARN, 'id': 'good'}]})
+        source_arn = (
+            'arn:aws:execute-api:us-west-2:1:rest-api-id/authorizers/good'
+        )
+        # There's no lambda stub because add_permission isn't called.
+        stubbed_session.activate_stubs()
+        returned = TypedAWSClient(
+            stubbed_session).add_permission_for_authorizer(
+                'rest-api-id', self.FUNCTION_ARN, 'random-id', source_arn)
+        assert returned == source_arn
+        stubbed_session.verify_stubs()
+
     def test_value_error_raised_for_unknown_function(self, stubbed_session):
         apigateway = stubbed_session.stub('apigateway')
         apigateway.get_authorizers(restApiId='rest-api-id').returns({
@@ -1036,7 +1118,7 @@ def test_import_rest_api(stubbed_session):
     apig = stubbed_session.stub('apigateway')
     swagger_doc = {'swagger': 'doc'}
     apig.import_rest_api(
-        body=json.dumps(swagger_doc, indent=2)).returns(
+        body=b'{"swagger":"doc"}').returns(
             {'id': 'rest_api_id'})
 
     stubbed_session.activate_stubs()
@@ -1052,7 +1134,7 @@ def test_update_api_from_swagger(stubbed_session):
     apig.put_rest_api(
         restApiId='rest_api_id',
         mode='overwrite',
-        body=json.dumps(swagger_doc, indent=2)).returns({})
+        body=b'{"swagger":"doc"}').returns({})
 
     stubbed_session.activate_stubs()
     awsclient = TypedAWSClient(stubbed_session)
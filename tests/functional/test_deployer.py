@@ -103,6 +103,9 @@ def test_osutils_proxies_os_functions(tmpdir):
     assert osutils.file_exists(app_file)
     assert osutils.get_file_contents(app_file) == b'hello'
     assert osutils.open(app_file, 'rb').read() == b'hello'
+    contents = osutils.mmap_file_contents(app_file)
+    assert contents[:] == b'hello'
+    contents.close()
     osutils.remove_file(app_file)
     # Removing again doesn't raise an error.
     osutils.remove_file(app_file)
@@ -2,6 +2,8 @@ import botocore.session
 import json
 import os
 import socket
+import sys
+import time
 
 import pytest
 import mock
@@ -43,6 +45,13 @@ class SimpleStub(object):
         pass
 
 
+class InMemoryFileContents(bytes):
+    # Stands in for the memory map returned by
+    # OSUtils.mmap_file_contents().
+    def close(self):
+        pass
+
+
 class InMemoryOSUtils(object):
     def __init__(self, filemap=None):
         if filemap is None:
@@ -55,6 +64,9 @@ class InMemoryOSUtils(object):
     def get_file_contents(self, filename, binary=True):
         return self.filemap[filename]
 
+    def mmap_file_contents(self, filename):
+        return InMemoryFileContents(self.filemap[filename])
+
     def set_file_contents(self, filename, contents, binary=True):
         self.filemap[filename] = contents
 
@@ -305,6 +317,104 @@ def test_can_record_policy_to_disk(app_policy):
     assert app_policy.load_last_policy(config) == latest_policy
 
 
+def create_policy_handler(osutils, generated_policy):
+    policy_gen = mock.Mock(spec=AppPolicyGenerator)
+    policy_gen.generate_policy.return_value = generated_policy
+    return ApplicationPolicyHandler(osutils, policy_gen)
+
+
+def test_recorded_policy_reused_for_unchanged_source(in_memory_osutils):
+    in_memory_osutils.filemap['./app.py'] = b'# app source'
+    config = Config.create(project_dir='.', autogen_policy=True)
+    recorded = {'Statement': ['recorded']}
+
+    def record_policy():
+        app_policy = create_policy_handler(in_memory_osutils, recorded)
+        app_policy.record_policy(
+            config, app_policy.generate_policy_from_app_source(config))
+
+    def generate_policy():
+        app_policy = create_policy_handler(
+            in_memory_osutils, {'Statement': ['new']})
+        return app_policy.generate_policy_from_app_source(config)
+
+    record_policy()
+    assert generate_policy() == recorded
+    policy_file = os.path.join('.', '.chalice', 'policy.json')
+    in_memory_osutils.filemap[policy_file] = b'{"Statement": ["edited"]}'
+    assert generate_policy() == {'Statement': ['new']}
+    record_policy()
+    in_memory_osutils.filemap['./app.py'] = b'# new app source'
+    assert generate_policy() == {'Statement': ['new']}
+
+
+def test_policy_hash_uses_source_it_was_generated_from(in_memory_osutils):
+    in_memory_osutils.filemap['./app.py'] = b'# app source'
+    config = Config.create(project_dir='.', autogen_policy=True)
+    app_policy = create_policy_handler(
+        in_memory_osutils, {'Statement': ['old']})
+    policy = app_policy.generate_policy_from_app_source(config)
+    # The app source changes while the user is being prompted.
+    in_memory_osutils.filemap['./app.py'] = b'# new app source'
+    app_policy.record_policy(config, policy)
+    app_policy = create_policy_handler(
+        in_memory_osutils, {'Statement': ['new']})
+    assert app_policy.generate_policy_from_app_source(config) == {
+        'Statement': ['new']}
+
+
+def test_policy_regenerated_when_botocore_version_changes(in_memory_osutils):
+    in_memory_osutils.filemap['./app.py'] = b'# app source'
+    config = Config.create(project_dir='.', autogen_policy=True)
+    app_policy = create_policy_handler(
+        in_memory_osutils, {'Statement': ['recorded']})
+    app_policy.record_policy(
+        config, app_policy.generate_policy_from_app_source(config))
+    app_policy = create_policy_handler(
+        in_memory_osutils, {'Statement': ['new']})
+    with mock.patch('botocore.__version__', '0.0.0'):
+        policy = app_policy.generate_policy_from_app_source(config)
+    assert policy == {'Statement': ['new']}
+
+
+def test_policy_filename_resolved_once(in_memory_osutils):
+    osutils = mock.Mock(wraps=in_memory_osutils)
+    app_policy = ApplicationPolicyHandler(
+        osutils, AppPolicyGenerator(osutils))
+    config = Config.create(project_dir='.')
+    app_policy.load_last_policy(config)
+    app_policy.record_policy(config, {"Statement": ["policy"]})
+    app_policy.load_last_policy(config)
+    policy_filename = os.path.join('.', '.chalice', 'policy-dev.json')
+    existence_checks = [c for c in osutils.file_exists.call_args_list
+                        if c == mock.call(policy_filename)]
+    assert len(existence_checks) == 1
+
+
+def test_recorded_policy_is_indented_with_sorted_keys(app_policy,
+                                                      in_memory_osutils):
+    latest_policy = {"Version": "2012-10-17", "Statement": ["policy"]}
+    config = Config.create(project_dir='.')
+    app_policy.record_policy(config, latest_policy)
+    assert list(in_memory_osutils.filemap.values()) == [
+        b'{\n'
+        b'  "Statement": [\n'
+        b'    "policy"\n'
+        b'  ],\n'
+        b'  "Version": "2012-10-17"\n'
+        b'}'
+    ]
+
+
+def test_recorded_policy_writes_non_ascii_as_utf8(app_policy,
+                                                  in_memory_osutils):
+    config = Config.create(project_dir='.')
+    app_policy.record_policy(config, {"Sid": u"caf\u00e9"})
+    assert list(in_memory_osutils.filemap.values()) == [
+        b'{\n  "Sid": "caf\xc3\xa9"\n}']
+    assert app_policy.load_last_policy(config) == {"Sid": u"caf\u00e9"}
+
+
 def test_trailing_slash_routes_result_in_error():
     app = Chalice('appname')
     app.routes = {'/trailing-slash/': None}
@@ -313,6 +423,14 @@ def test_trailing_slash_routes_result_in_error():
         validate_configuration(config)
 
 
+def test_all_trailing_slash_routes_are_reported():
+    app = Chalice('appname')
+    app.routes = {'/': None, '/foo/': None, '/bar/': None, '/baz': None}
+    with pytest.raises(ValueError) as excinfo:
+        validate_routes(app.routes)
+    assert excinfo.match('/bar/, /foo/$')
+
+
 def test_validate_python_version_invalid():
     config = mock.Mock(spec=Config)
     config.lambda_python_version = 'python1.0'
@@ -448,6 +566,19 @@ class TestChaliceDeploymentError(object):
         assert 'Connection aborted.' in deploy_error_msg
         assert 'Some vague reason' not in deploy_error_msg
 
+    def test_error_msg_for_unexpected_connection_error(self):
+        lambda_error = DeploymentPackageTooLargeError(
+            RequestsConnectionError('Unexpected connection error'),
+            context=LambdaErrorContext(
+                function_name='foo',
+                client_method_name='create_function',
+                deployment_size=1024 ** 2
+            )
+        )
+        deploy_error = ChaliceDeploymentError(lambda_error)
+        deploy_error_msg = str(deploy_error)
+        assert 'Unexpected connection error' in deploy_error_msg
+
     def test_simplifies_error_msg_for_broken_pipe(self):
         lambda_error = DeploymentPackageTooLargeError(
             RequestsConnectionError(
@@ -725,6 +856,84 @@ def test_lambda_deployer_repeated_deploy(app_policy, sample_app):
     )
 
 
+def test_lambda_deployer_updates_managed_role_once(sample_app_with_auth):
+    osutils = InMemoryOSUtils({'packages.zip': b'package contents',
+                               './app.py': ''})
+    app_policy = ApplicationPolicyHandler(
+        osutils, AppPolicyGenerator(osutils))
+    aws_client = mock.Mock(spec=TypedAWSClient)
+    packager = mock.Mock(spec=LambdaDeploymentPackager)
+    packager.deployment_package_filename.return_value = 'packages.zip'
+    aws_client.lambda_function_exists.return_value = True
+    aws_client.get_role_arn_for_name.return_value = 'role-arn'
+    aws_client.update_function.return_value = {"FunctionArn": "myarn"}
+    cfg = Config.create(
+        chalice_stage='dev',
+        chalice_app=sample_app_with_auth,
+        app_name='appname',
+        project_dir='.',
+    )
+    aws_client.get_function_configuration.return_value = {
+        'Runtime': cfg.lambda_python_version,
+    }
+    d = LambdaDeployer(aws_client, packager, NoPrompt(), osutils, app_policy)
+    deployed = DeployedResources(
+        'api', 'api_handler_arn', 'appname-dev',
+        None, 'dev', None, None, {})
+    d.deploy(cfg, deployed, 'dev')
+
+    # The API handler and the auth handler share a role, so the role
+    # should only be looked up and updated once.
+    aws_client.get_role_arn_for_name.assert_called_once_with('appname-dev')
+    assert aws_client.put_role_policy.call_count == 1
+    assert aws_client.update_function.call_count == 2
+    # Similarly the deployment package filename is only computed once.
+    packager.deployment_package_filename.assert_called_once_with('.')
+    # There's too few functions to list every function in the region,
+    # so each function is checked individually.
+    assert not aws_client.list_function_names.called
+    assert aws_client.lambda_function_exists.call_count == 2
+
+
+def test_policy_diff_is_printed_on_role_update(capsys):
+    aws_client = mock.Mock(spec=TypedAWSClient)
+    app_policy = mock.Mock(spec=ApplicationPolicyHandler)
+    app_policy.generate_policy_from_app_source.return_value = {
+        'Statement': [{'Action': ['s3:GetObject', 's3:PutObject']}]}
+    app_policy.load_last_policy.return_value = {
+        'Statement': [{'Action': ['s3:DeleteObject']}]}
+    d = LambdaDeployer(aws_client, None, NoPrompt(), None, app_policy)
+    d._update_role_with_latest_policy('appname-dev', Config.create())
+
+    out, _ = capsys.readouterr()
+    added, removed = out.split('will be removed')
+    assert 's3:GetObject\n' in added
+    assert 's3:PutObject\n' in added
+    assert 's3:DeleteObject\n' in removed
+
+
+def test_role_prompt_waits_for_deployment_package():
+    events = []
+    aws_client = mock.Mock(spec=TypedAWSClient)
+    aws_client.get_role_arn_for_name.return_value = 'role-arn'
+    packager = mock.Mock(spec=LambdaDeploymentPackager)
+    packager.create_deployment_package.side_effect = \
+        lambda project_dir: events.append('package') or 'packages.zip'
+    app_policy = mock.Mock(spec=ApplicationPolicyHandler)
+    app_policy.generate_policy_from_app_source.return_value = {
+        'Statement': [{'Action': ['s3:GetObject']}]}
+    app_policy.load_last_policy.return_value = {'Statement': []}
+    prompter = mock.Mock(spec=NoPrompt)
+    prompter.confirm.side_effect = lambda *args, **kwargs: events.append(
+        'prompt')
+    d = LambdaDeployer(aws_client, packager, prompter, None, app_policy,
+                       parallel_deploy=True)
+    role_arn, zip_filename = d._create_role_and_deployment_package(
+        Config.create(project_dir='.', manage_iam_role=True), 'appname-dev')
+    assert (role_arn, zip_filename) == ('role-arn', 'packages.zip')
+    assert events == ['package', 'prompt']
+
+
 def test_lambda_deployer_delete():
     aws_client = mock.Mock(spec=TypedAWSClient)
     aws_client.get_role_arn_for_name.return_value = 'arn_prefix/role_name'
@@ -744,6 +953,24 @@ def test_lambda_deployer_delete():
     aws_client.delete_role.assert_called_with('role_name')
 
 
+@pytest.mark.parametrize('parallel_deploy', [True, False])
+def test_lambda_deployer_deletes_all_auth_handlers(parallel_deploy):
+    aws_client = mock.Mock(spec=TypedAWSClient)
+    aws_client.get_role_arn_for_name.return_value = 'arn_prefix/role_name'
+    deployed = DeployedResources(
+        'api', 'api_handler_arn/lambda_name', 'api-handler',
+        None, 'dev', None, None,
+        {'auth1': 'auth1-arn', 'auth2': 'auth2-arn', 'auth3': 'auth3-arn'})
+    d = LambdaDeployer(
+        aws_client, None, CustomConfirmPrompt(False), None, None,
+        parallel_deploy=parallel_deploy)
+    d.delete(deployed)
+
+    deleted = [c[0][0] for c in aws_client.delete_function.call_args_list]
+    assert deleted[0] == 'api-handler'
+    assert sorted(deleted[1:]) == ['auth1-arn', 'auth2-arn', 'auth3-arn']
+
+
 def test_lambda_deployer_delete_already_deleted(capsys):
     lambda_function_name = 'lambda_name'
     aws_client = mock.Mock(spec=TypedAWSClient)
@@ -801,7 +1028,9 @@ def test_prompted_on_runtime_change_can_reject_change(app_policy, sample_app):
     assert 'runtime will change' in message
 
 
-def test_lambda_deployer_initial_deploy(app_policy, sample_app):
+@pytest.mark.parametrize('parallel_deploy', [True, False])
+def test_lambda_deployer_initial_deploy(app_policy, sample_app,
+                                        parallel_deploy):
     osutils = InMemoryOSUtils({'packages.zip': b'package contents'})
     aws_client = mock.Mock(spec=TypedAWSClient)
     aws_client.create_function.return_value = 'lambda-arn'
@@ -820,7 +1049,8 @@ def test_lambda_deployer_initial_deploy(app_policy, sample_app):
         tags={'mykey': 'myvalue'}
     )
 
-    d = LambdaDeployer(aws_client, packager, None, osutils, app_policy)
+    d = LambdaDeployer(aws_client, packager, None, osutils, app_policy,
+                       parallel_deploy=parallel_deploy)
     deployed = d.deploy(cfg, None, 'dev')
     assert deployed == {
         'api_handler_arn': 'lambda-arn',
@@ -988,7 +1218,71 @@ class TestAuthHandlersAreAuthorized(object):
         # We should have add permission for the authorizer to invoke
         # the auth lambda function.
         aws_client.add_permission_for_authorizer.assert_called_with(
-            'rest-api-id', 'myauth:arn', mock.ANY)
+            'rest-api-id', 'myauth:arn', mock.ANY, None)
+
+    @pytest.mark.parametrize('parallel_deploy', [True, False])
+    def test_adds_permission_for_each_auth_handler(self, sample_app_with_auth,
+                                                   parallel_deploy):
+        aws_client = mock.Mock(spec=TypedAWSClient, region_name='us-west-2')
+        cfg = Config.create(
+            chalice_stage='dev', app_name='myapp',
+            chalice_app=sample_app_with_auth,
+            manage_iam_role=False, iam_role_arn='role-arn',
+            project_dir='.'
+        )
+        d = APIGatewayDeployer(aws_client, parallel_deploy=parallel_deploy)
+        deployed_resources = {
+            'api_handler_arn': (
+                'arn:aws:lambda:us-west-2:1:function:myapp-dev'
+            ),
+            'api_handler_name': 'myapp-dev',
+            'lambda_functions': {
+                'myapp-dev-myauth': 'myauth:arn',
+                'myapp-dev-otherauth': 'otherauth:arn',
+            },
+        }
+        aws_client.import_rest_api.return_value = 'rest-api-id'
+        d.deploy(cfg, None, deployed_resources)
+        aws_client.add_permission_for_apigateway_if_needed.assert_called_with(
+            'myapp-dev', 'us-west-2', '1', 'rest-api-id', mock.ANY)
+        calls = aws_client.add_permission_for_authorizer.call_args_list
+        assert sorted(c[0][1] for c in calls) == [
+            'myauth:arn', 'otherauth:arn']
+        statement_ids = [c[0][2] for c in calls] + [
+            aws_client.add_permission_for_apigateway_if_needed.call_args[0][4]]
+        assert len(set(statement_ids)) == 3
+
+    def test_previous_auth_handler_permissions_are_reused(
+            self, sample_app_with_auth):
+        aws_client = mock.Mock(spec=TypedAWSClient, region_name='us-west-2')
+        aws_client.add_permission_for_authorizer.side_effect = \
+            lambda rest_api_id, function_arn, *args: function_arn + ':source'
+        cfg = Config.create(
+            chalice_stage='dev', app_name='myapp',
+            chalice_app=sample_app_with_auth,
+            manage_iam_role=False, iam_role_arn='role-arn',
+            project_dir='.'
+        )
+        d = APIGatewayDeployer(aws_client)
+        deployed_resources = {
+            'api_handler_arn': (
+                'arn:aws:lambda:us-west-2:1:function:myapp-dev'
+            ),
+            'api_handler_name': 'myapp-dev',
+            'lambda_functions': {
+                'myapp-dev-myauth': 'myauth:arn',
+            },
+            'apigw_permissions': {
+                'myauth:arn': 'previous:source',
+            },
+        }
+        aws_client.import_rest_api.return_value = 'rest-api-id'
+        d.deploy(cfg, None, deployed_resources)
+        aws_client.add_permission_for_authorizer.assert_called_with(
+            'rest-api-id', 'myauth:arn', mock.ANY, 'previous:source')
+        assert deployed_resources['apigw_permissions'] == {
+            'myauth:arn': 'myauth:arn:source',
+        }
 
 
 class TestLambdaInitialDeploymentWithConfigurations(object):
@@ -1139,6 +1433,194 @@ class TestLambdaInitialDeploymentWithConfigurations(object):
             )
         ]
 
+    @pytest.mark.parametrize('parallel_deploy', [True, False])
+    def test_can_create_multiple_auth_handlers(self, sample_app_with_auth,
+                                               parallel_deploy):
+        @sample_app_with_auth.authorizer('otherauth')
+        def otherauth(auth_request):
+            pass
+
+        config = self.create_config_obj(sample_app_with_auth)
+        deployer = LambdaDeployer(
+            self.aws_client, self.packager, None, self.osutils,
+            self.app_policy, parallel_deploy=parallel_deploy)
+        self.aws_client.lambda_function_exists.return_value = False
+        self.aws_client.create_function.side_effect = \
+            lambda function_name, **kwargs: 'arn:%s' % function_name
+        deployed = deployer.deploy(config, None, stage_name='dev')
+        assert deployed['lambda_functions'] == {
+            'myapp-dev-myauth': 'arn:myapp-dev-myauth',
+            'myapp-dev-otherauth': 'arn:myapp-dev-otherauth',
+        }
+        created = sorted(
+            c[1]['function_name']
+            for c in self.aws_client.create_function.call_args_list)
+        assert created == [
+            'myapp-dev', 'myapp-dev-myauth', 'myapp-dev-otherauth']
+        # The deployment package is only looked up once and shared
+        # across all the auth handlers.
+        assert self.packager.deployment_package_filename.call_count == 1
+
+    @pytest.mark.parametrize('parallel_deploy', [True, False])
+    def test_auth_handler_uses_its_own_role(self, sample_app_with_auth,
+                                            parallel_deploy):
+        disk_config = {
+            'app_name': 'myapp',
+            'iam_role_arn': 'role-arn',
+            'manage_iam_role': False,
+            'stages': {
+                'dev': {
+                    'lambda_functions': {
+                        'myauth': {
+                            'iam_role_arn': 'auth-role-arn',
+                        }
+                    }
+                }
+            }
+        }
+        config = Config(
+            'dev',
+            config_from_disk=disk_config,
+            user_provided_params={'chalice_app': sample_app_with_auth,
+                                  'project_dir': '.'}
+        )
+        deployer = LambdaDeployer(
+            self.aws_client, self.packager, None, self.osutils,
+            self.app_policy, parallel_deploy=parallel_deploy)
+        self.aws_client.lambda_function_exists.return_value = False
+        self.aws_client.create_function.side_effect = \
+            lambda function_name, **kwargs: 'arn:%s' % function_name
+        deployer.deploy(config, None, stage_name='dev')
+        roles = dict(
+            (c[1]['function_name'], c[1]['role_arn'])
+            for c in self.aws_client.create_function.call_args_list)
+        assert roles == {
+            'myapp-dev': 'role-arn',
+            'myapp-dev-myauth': 'auth-role-arn',
+        }
+
+    @pytest.mark.skipif(sys.version_info < (3, 6),
+                        reason='Dicts are only ordered on python 3.6+.')
+    def test_auth_handlers_recorded_in_order(self, sample_app_with_auth):
+        self.add_auth_handlers(sample_app_with_auth, 2)
+        config = self.create_config_obj(sample_app_with_auth)
+        deployer = LambdaDeployer(
+            self.aws_client, self.packager, None, self.osutils,
+            self.app_policy, parallel_deploy=True)
+        self.aws_client.lambda_function_exists.return_value = False
+
+        def create_function(function_name, **kwargs):
+            # The first auth handler finishes last.
+            if function_name == 'myapp-dev-myauth':
+                time.sleep(0.1)
+            return 'arn:%s' % function_name
+
+        self.aws_client.create_function.side_effect = create_function
+        deployed = deployer.deploy(config, None, stage_name='dev')
+        assert list(deployed['lambda_functions']) == [
+            'myapp-dev-myauth', 'myapp-dev-auth0', 'myapp-dev-auth1']
+
+    def test_permissions_only_kept_for_existing_auth_handlers(
+            self, sample_app_with_auth):
+        @sample_app_with_auth.authorizer('otherauth')
+        def otherauth(auth_request):
+            pass
+
+        config = self.create_config_obj(sample_app_with_auth)
+        deployer = LambdaDeployer(
+            self.aws_client, self.packager, None, self.osutils,
+            self.app_policy)
+        existing = DeployedResources(
+            'api', self.lambda_arn, 'myapp-dev', None, 'dev', None, None,
+            {'myapp-dev-myauth': 'arn:myapp-dev-myauth',
+             'myapp-dev-otherauth': 'arn:myapp-dev-otherauth'},
+            {'arn:myapp-dev-myauth': 'myauth-source',
+             'arn:myapp-dev-otherauth': 'otherauth-source'})
+        # The otherauth function was deleted outside of chalice so
+        # it's recreated and no longer has its permissions.
+        self.aws_client.lambda_function_exists.side_effect = \
+            lambda name: name == 'myapp-dev-myauth'
+        self.aws_client.update_function.return_value = {
+            'FunctionArn': 'arn:myapp-dev-myauth'}
+        self.aws_client.create_function.side_effect = \
+            lambda function_name, **kwargs: 'arn:%s' % function_name
+        deployed = deployer.deploy(config, existing, stage_name='dev')
+        assert deployed['apigw_permissions'] == {
+            'arn:myapp-dev-myauth': 'myauth-source',
+        }
+
+    def add_auth_handlers(self, app, count):
+        for i in range(count):
+            app.authorizer('auth%s' % i)(lambda auth_request: None)
+
+    def test_functions_listed_when_many_to_check(self, sample_app_with_auth):
+        self.add_auth_handlers(sample_app_with_auth, 4)
+        config = self.create_config_obj(sample_app_with_auth)
+        deployer = LambdaDeployer(
+            self.aws_client, self.packager, None, self.osutils,
+            self.app_policy)
+        self.aws_client.list_function_names.return_value = {
+            'myapp-dev-myauth', 'unrelated-function'}
+        self.aws_client.update_function.return_value = {
+            'FunctionArn': 'arn:myapp-dev-myauth'}
+        self.aws_client.create_function.side_effect = \
+            lambda function_name, **kwargs: 'arn:%s' % function_name
+        deployed = deployer.deploy(config, None, stage_name='dev')
+        self.aws_client.list_function_names.assert_called_once_with(
+            max_pages=4)
+        assert not self.aws_client.lambda_function_exists.called
+        assert self.aws_client.update_function.call_count == 1
+        assert len(deployed['lambda_functions']) == 5
+
+    def test_functions_checked_individually_if_list_denied(
+            self, sample_app_with_auth):
+        self.add_auth_handlers(sample_app_with_auth, 4)
+        config = self.create_config_obj(sample_app_with_auth)
+        deployer = LambdaDeployer(
+            self.aws_client, self.packager, None, self.osutils,
+            self.app_policy)
+        self.aws_client.list_function_names.side_effect = ClientError(
+            {'Error': {'Code': 'AccessDeniedException', 'Message': ''}},
+            'ListFunctions')
+        self.aws_client.lambda_function_exists.side_effect = \
+            lambda name: name == 'myapp-dev-myauth'
+        self.aws_client.update_function.return_value = {
+            'FunctionArn': 'arn:myapp-dev-myauth'}
+        self.aws_client.create_function.side_effect = \
+            lambda function_name, **kwargs: 'arn:%s' % function_name
+        deployed = deployer.deploy(config, None, stage_name='dev')
+        assert self.aws_client.lambda_function_exists.call_count == 5
+        assert self.aws_client.update_function.call_count == 1
+        assert len(deployed['lambda_functions']) == 5
+
+    def test_functions_checked_individually_if_too_many_to_list(
+            self, sample_app_with_auth):
+        self.add_auth_handlers(sample_app_with_auth, 4)
+        config = self.create_config_obj(sample_app_with_auth)
+        deployer = LambdaDeployer(
+            self.aws_client, self.packager, None, self.osutils,
+            self.app_policy)
+        self.aws_client.list_function_names.return_value = None
+        self.aws_client.lambda_function_exists.return_value = False
+        self.aws_client.create_function.side_effect = \
+            lambda function_name, **kwargs: 'arn:%s' % function_name
+        deployed = deployer.deploy(config, None, stage_name='dev')
+        assert self.aws_client.lambda_function_exists.call_count == 5
+        assert len(deployed['lambda_functions']) == 5
+
+    def test_deployment_package_read_once(self, sample_app_with_auth):
+        config = self.create_config_obj(sample_app_with_auth)
+        osutils = mock.Mock(wraps=self.osutils)
+        deployer = LambdaDeployer(
+            self.aws_client, self.packager, None, osutils,
+            self.app_policy)
+        self.aws_client.lambda_function_exists.return_value = False
+        self.aws_client.create_function.side_effect = [
+            self.lambda_arn, 'arn:auth-function']
+        deployer.deploy(config, None, stage_name='dev')
+        osutils.mmap_file_contents.assert_called_once_with(
+            self.package_name)
+
     def test_unreferenced_functions_are_deleted(self, sample_app_with_auth):
         # Existing resources is the set of resources that have
         # *previously* been deployed.